@@ -0,0 +1,71 @@
+import importlib.util
+
+import numpy as np
+
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+# Below this many grid cells numpy is faster than importing numba and
+# loading the compiled kernel.
+NUMBA_MIN_CELLS = 30_000_000
+
+
+def cut_outside_radius_numpy(x_coords: np.ndarray, y_coords: np.ndarray,
+                             width: float, height: float,
+                             radius: float) -> tuple:
+    """Select the units of the grid that are fully inside a radius.
+
+    Same selection and order as the numba kernel, broadcasting the x
+    column against the y row instead of meshing.
+
+    Args:
+        x_coords (np.ndarray): x of the D corners of the grid columns
+        y_coords (np.ndarray): y of the D corners of the grid rows
+        width (float): width of the unit
+        height (float): height of the unit
+        radius (float): radius the units must be inside of
+
+    Returns:
+        tuple: (D_corners_x, D_corners_y) of the kept units
+    """
+    # the corner furthest from the centre decides if the unit fits
+    x_furthest = np.maximum(np.abs(x_coords),
+                            np.abs(x_coords + width))[:, None]
+    y_furthest = np.maximum(np.abs(y_coords),
+                            np.abs(y_coords + height))[None, :]
+
+    keep = ((x_furthest*x_furthest + y_furthest*y_furthest < radius*radius) &
+            (radius > 0))
+    i_keep, j_keep = np.nonzero(keep)
+
+    return x_coords[i_keep], y_coords[j_keep]
+
+
+def cut_outside_radius(x_coords: np.ndarray, y_coords: np.ndarray,
+                       width: float, height: float,
+                       radius: float) -> tuple:
+    """Select the units of the grid that are fully inside a radius, with
+    the numba kernel for large grids when numba is installed and numpy
+    otherwise.
+
+    Args:
+        x_coords (np.ndarray): x of the D corners of the grid columns
+        y_coords (np.ndarray): y of the D corners of the grid rows
+        width (float): width of the unit
+        height (float): height of the unit
+        radius (float): radius the units must be inside of
+
+    Returns:
+        tuple: (D_corners_x, D_corners_y) of the kept units
+    """
+    if HAS_NUMBA and x_coords.size*y_coords.size >= NUMBA_MIN_CELLS:
+        try:
+            from sipmarray._numba_kernels import cut_outside_radius_numba
+        except ImportError:
+            # installed but broken numba, e.g. built for another numpy
+            pass
+        else:
+            return cut_outside_radius_numba(x_coords, y_coords,
+                                            width, height, radius)
+
+    return cut_outside_radius_numpy(x_coords, y_coords,
+                                    width, height, radius)
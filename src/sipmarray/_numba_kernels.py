@@ -0,0 +1,62 @@
+import numpy as np
+from numba import njit, prange
+
+# Only imported by sipmarray._kernels for grids large enough to pay for
+# importing numba and loading the compiled kernel.
+
+
+@njit(parallel=True, cache=True)
+def cut_outside_radius_numba(x_coords: np.ndarray, y_coords: np.ndarray,
+                             width: float, height: float,
+                             radius: float) -> tuple:
+    """Select the units of the grid that are fully inside a radius.
+
+    The grid is given by the bottom left (D) corner positions along each
+    axis and is walked in the same order as a flattened 'ij' meshgrid. A
+    unit is kept if its corner furthest from the centre is inside the
+    radius. Done in two passes (count, then fill) so the rejected cells
+    are never stored.
+
+    Args:
+        x_coords (np.ndarray): x of the D corners of the grid columns
+        y_coords (np.ndarray): y of the D corners of the grid rows
+        width (float): width of the unit
+        height (float): height of the unit
+        radius (float): radius the units must be inside of
+
+    Returns:
+        tuple: (D_corners_x, D_corners_y) of the kept units
+    """
+    n_x = x_coords.size
+    n_y = y_coords.size
+    radius_2 = radius*radius
+
+    counts = np.zeros(n_x, dtype=np.int64)
+    if radius > 0:
+        for i in prange(n_x):
+            x_furthest = max(abs(x_coords[i]), abs(x_coords[i] + width))
+            n_inside = 0
+            for j in range(n_y):
+                y_furthest = max(abs(y_coords[j]), abs(y_coords[j] + height))
+                if x_furthest*x_furthest + y_furthest*y_furthest < radius_2:
+                    n_inside += 1
+            counts[i] = n_inside
+
+    offsets = np.zeros(n_x + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+
+    D_corners_x = np.empty(offsets[n_x], dtype=x_coords.dtype)
+    D_corners_y = np.empty(offsets[n_x], dtype=y_coords.dtype)
+    for i in prange(n_x):
+        if counts[i] == 0:
+            continue
+        x_furthest = max(abs(x_coords[i]), abs(x_coords[i] + width))
+        k = offsets[i]
+        for j in range(n_y):
+            y_furthest = max(abs(y_coords[j]), abs(y_coords[j] + height))
+            if x_furthest*x_furthest + y_furthest*y_furthest < radius_2:
+                D_corners_x[k] = x_coords[i]
+                D_corners_y[k] = y_coords[j]
+                k += 1
+
+    return D_corners_x, D_corners_y
@@ -1,9 +1,45 @@
-import matplotlib.pyplot as plt
+import os
+
 import numpy as np
-from matplotlib.collections import PatchCollection
-from matplotlib.patches import Circle, Rectangle
 
-from sipmarray.unit import SiPMunit
+from sipmarray._kernels import cut_outside_radius
+from sipmarray.unit import SiPMunit, _rectangle_vertices
+
+
+def _write_table(file_name, table: np.ndarray, header: str) -> None:
+    """Write a 2D array to a text file with 3 decimal places, in the same
+    layout as `np.savetxt` with a ', ' delimiter.
+
+    All the rows are formatted in a single string operation instead of
+    row by row.
+
+    Args:
+        file_name (str, path-like or file object): where to write. As in
+            `np.savetxt`, a name ending in '.gz' is written gzipped.
+        table (np.ndarray): array of shape (rows, columns) to write
+        header (str): header line, written as a comment
+    """
+    n_rows, n_cols = table.shape
+    row_fmt = ', '.join(['%.3f'] * n_cols) + '\n'
+    text = (f'# {header}\n' + 
+            (row_fmt * n_rows) % tuple(table.ravel().tolist()))
+
+    if hasattr(file_name, 'write'):
+        try:
+            file_name.write(text)
+        except TypeError:
+            # file opened in binary mode
+            file_name.write(text.encode('latin1'))
+        return
+
+    file_name = os.fspath(file_name)
+    if file_name.endswith('.gz'):
+        import gzip
+        with gzip.open(file_name, 'wt', encoding='latin1') as f:
+            f.write(text)
+    else:
+        with open(file_name, 'w', encoding='latin1') as f:
+            f.write(text)
 
 
 class SiPMarray():
@@ -27,9 +63,9 @@ class SiPMarray():
         self.intra_sipm_distance = intra_sipm_distance
         self.sipmunit = self.load_sipmunit(sipm_model, custom_unit_params)
         
-        corner_meshes = self.make_corners()
-        self.cut_outside_array(corner_meshes)
-        self.n_sipms = self.A_corners_xx.count()
+        corner_positions = self.make_corners()
+        self.cut_outside_array(corner_positions)
+        self.n_sipms = self.D_corners_x.size
 
         self.total_array_area = np.pi * (self.array_diameter/2)**2
         self.total_sipm_area = self.n_sipms * self.sipmunit.total_area
@@ -38,77 +74,70 @@ class SiPMarray():
 
 
     def make_corners(self) -> tuple:
-        """Define where the corners of the sipms are
+        """Define where the bottom left (D) corners of the sipms are along 
+        each axis. The grid of units is every combination of the two.
+
+        Returns:
+            tuple: (D_corner_x, D_corner_y)
+        """
+        D_corner_x = self._mirror_positions(self.sipmunit.width_unit)
+        D_corner_y = self._mirror_positions(self.sipmunit.height_unit)
+
+        return (D_corner_x, D_corner_y)
+    
+    def _mirror_positions(self, unit_size: float) -> np.ndarray:
+        """Positions of the D corners along one axis, symmetric around 0.
+
+        Args:
+            unit_size (float): size of the unit along the axis
 
         Returns:
-            tuple: (A_corner_xx, A_corner_yy, B_corner_xx, B_corner_yy, 
-                    C_corner_xx, C_corner_yy, D_corner_xx, D_corner_yy)
+            np.ndarray: sorted positions of the D corners
         """
         half_intra_space = self.intra_sipm_distance/2
 
-        # make the center a not
-        D_corner_x = np.arange(
+        # make the center a not: the first unit on each side is half an 
+        # intra space away from it and the negative side is an exact mirror
+        positive = np.arange(
             0 + half_intra_space,
-            self.array_diameter/2 + self.sipmunit.width_unit + self.intra_sipm_distance,
-            self.sipmunit.width_unit + self.intra_sipm_distance)
-        D_corner_y = np.arange(
-            0 + half_intra_space, 
-            self.array_diameter/2 +  self.sipmunit.height_unit + self.intra_sipm_distance, 
-            self.sipmunit.height_unit + self.intra_sipm_distance)
-
-        D_corner_x = np.concatenate(
-            [-np.flip(D_corner_x) - self.sipmunit.width_unit,
-             D_corner_x])
-        D_corner_y = np.concatenate(
-            [-np.flip(D_corner_y) - self.sipmunit.height_unit,
-             D_corner_y])
-
-        D_corner_xx, D_corner_yy = np.meshgrid(D_corner_x, D_corner_y, indexing = 'ij') 
-
-        A_corner_xx = D_corner_xx
-        A_corner_yy = B_corner_yy = D_corner_yy + self.sipmunit.height_unit
-
-        B_corner_xx = C_corner_xx = D_corner_xx + self.sipmunit.width_unit
-        C_corner_yy = D_corner_yy
-        
-        return (A_corner_xx, A_corner_yy, B_corner_xx, B_corner_yy, 
-                C_corner_xx, C_corner_yy, D_corner_xx, D_corner_yy)
-    
-    def cut_outside_array(self, corner_meshes:tuple):
-        """Mask the sipms that are outside the array in a masked array.
+            self.array_diameter/2 + unit_size + self.intra_sipm_distance,
+            unit_size + self.intra_sipm_distance)
+        n_pos = positive.size
+
+        # fill both halves in place, without the temporaries of negating
+        # and concatenating; -u - p is bit-identical to -p - u
+        positions = np.empty(2*n_pos, dtype=positive.dtype)
+        np.subtract(-unit_size, positive[::-1], out=positions[:n_pos])
+        positions[n_pos:] = positive
+        return positions
+
+    def cut_outside_array(self, corner_positions:tuple):
+        """Keep only the sipms that are inside the array, storing the flat
+        coordinates of their corners.
 
         Args:
-            corner_meshes (tuple): tuple with all the corner meshes
+            corner_positions (tuple): positions of the D corners along x 
+                and along y
         """        
-        (A_corner_xx, A_corner_yy, B_corner_xx, B_corner_yy, 
-                C_corner_xx, C_corner_yy, D_corner_xx, D_corner_yy) = corner_meshes
-        D_corner_rr = np.sqrt(D_corner_xx**2 + D_corner_yy**2)
+        D_corner_x, D_corner_y = corner_positions
+        radius_inside = self.array_diameter/2 - self.border_margin
 
-        A_corner_rr = np.sqrt(A_corner_xx**2 + A_corner_yy**2)
-        B_corner_rr = np.sqrt(B_corner_xx**2 + B_corner_yy**2)
-        C_corner_rr = np.sqrt(C_corner_xx**2 + C_corner_yy**2)
-        
-        A_mask_inside_array_rr = A_corner_rr < self.array_diameter/2 - self.border_margin
-        B_mask_inside_array_rr = B_corner_rr < self.array_diameter/2 - self.border_margin
-        C_mask_inside_array_rr = C_corner_rr < self.array_diameter/2 - self.border_margin
-        D_mask_inside_array_rr = D_corner_rr < self.array_diameter/2 - self.border_margin
-        
-        merged_mask = (~A_mask_inside_array_rr | 
-                       ~B_mask_inside_array_rr | 
-                       ~C_mask_inside_array_rr | 
-                       ~D_mask_inside_array_rr)
-        
-        self.D_corners_xx = np.ma.masked_array(D_corner_xx, mask= merged_mask)
-        self.D_corners_yy = np.ma.masked_array(D_corner_yy, mask= merged_mask)
+        D_corners_x, D_corners_y = cut_outside_radius(
+            D_corner_x, D_corner_y, 
+            self.sipmunit.width_unit, self.sipmunit.height_unit, 
+            radius_inside)
 
-        self.A_corners_xx = np.ma.masked_array(A_corner_xx, mask= merged_mask)
-        self.A_corners_yy = np.ma.masked_array(A_corner_yy, mask= merged_mask)
+        self.D_corners_x = D_corners_x
+        self.D_corners_y = D_corners_y
 
-        self.B_corners_xx = np.ma.masked_array(B_corner_xx, mask= merged_mask)
-        self.B_corners_yy = np.ma.masked_array(B_corner_yy, mask= merged_mask)
+        self.A_corners_x = D_corners_x
+        self.A_corners_y = D_corners_y + self.sipmunit.height_unit
 
-        self.C_corners_xx = np.ma.masked_array(C_corner_xx, mask= merged_mask)
-        self.C_corners_yy = np.ma.masked_array(C_corner_yy, mask= merged_mask)
+        self.B_corners_x = D_corners_x + self.sipmunit.width_unit
+        self.B_corners_y = self.A_corners_y
+
+        self.C_corners_x = self.B_corners_x
+        self.C_corners_y = D_corners_y
     
     def load_sipmunit(self, model: str,custom_unit_params:dict = {}):
         """Load the SiPM unit.
@@ -136,26 +165,21 @@ class SiPMarray():
         else:
             (x_sipm_centre, y_sipm_centre) = self.sipmunit.get_unit_centre()
         
-        D_corners_x_flatten = self.D_corners_xx.flatten().compressed()
-        D_corners_y_flatten = self.D_corners_yy.flatten().compressed()
-
-        xs = D_corners_x_flatten + x_sipm_centre
-        ys = D_corners_y_flatten + y_sipm_centre
+        centres = np.empty((2, self.D_corners_x.size), 
+                           dtype=self.D_corners_x.dtype)
+        np.add(self.D_corners_x, x_sipm_centre, out=centres[0])
+        np.add(self.D_corners_y, y_sipm_centre, out=centres[1])
 
-        return np.vstack((xs, ys))
+        return centres
     
     def export_centres(self, file_name, active_area: bool = True) -> None:
         """Export the centres of the SiPMs to a file.
 
         Args:
-            file_name (str): name of the file to write the centres into
+            file_name (str): name of, or file object to write the centres into
         """
         centres = self.get_centres(active_area=active_area)
-        np.savetxt(file_name, 
-                   centres.T, 
-                   header = 'x, y',
-                   delimiter=", ", 
-                   fmt='%.3f')
+        _write_table(file_name, centres.T, header = 'x, y')
     
     def get_corners_active(self) -> np.ndarray:
         """Get all the positions of the corners of the active area of the SiPMs.
@@ -165,29 +189,25 @@ class SiPMarray():
                 corners of the active area of the SiPMs
         """
         
-        A_corner_x = (self.D_corners_xx.flatten().compressed() + 
-                        self.sipmunit.D_corner_x_active)
-        B_corner_x = (self.D_corners_xx.flatten().compressed() + 
-                        self.sipmunit.D_corner_x_active +
-                        self.sipmunit.width_active)
-        C_corner_x = (self.D_corners_xx.flatten().compressed() + 
-                        self.sipmunit.D_corner_x_active +
-                        self.sipmunit.width_active)
-        D_corner_x = (self.D_corners_xx.flatten().compressed() + 
-                        self.sipmunit.D_corner_x_active)
-        A_corner_y = (self.D_corners_yy.flatten().compressed() + 
-                        self.sipmunit.D_corner_y_active + 
-                        self.sipmunit.height_active)
-        B_corner_y = (self.D_corners_yy.flatten().compressed() + 
-                        self.sipmunit.D_corner_y_active + 
-                        self.sipmunit.height_active)
-        C_corner_y = (self.D_corners_yy.flatten().compressed() + 
-                        self.sipmunit.D_corner_y_active)
-        D_corner_y = (self.D_corners_yy.flatten().compressed() + 
-                        self.sipmunit.D_corner_y_active)
-        
-        corners = np.vstack((A_corner_x, A_corner_y, B_corner_x, B_corner_y,
-                             C_corner_x, C_corner_y, D_corner_x, D_corner_y))
+        dx = self.D_corners_x
+        dy = self.D_corners_y
+        sipmunit = self.sipmunit
+        dxa = sipmunit.D_corner_x_active
+        dya = sipmunit.D_corner_y_active
+        wa = sipmunit.width_active
+        ha = sipmunit.height_active
+
+        # rows are A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y; left/right and
+        # bottom/top edges are shared by two corners each
+        corners = np.empty((8, dx.size), dtype=dx.dtype)
+        np.add(dx, dxa, out=corners[0])
+        np.add(corners[0], wa, out=corners[2])
+        np.add(dy, dya, out=corners[5])
+        np.add(corners[5], ha, out=corners[1])
+        corners[3] = corners[1]
+        corners[4] = corners[2]
+        corners[6] = corners[0]
+        corners[7] = corners[5]
         
         return corners
     
@@ -195,13 +215,11 @@ class SiPMarray():
         """Export the corners of the active area of the SiPMs to a file.
 
         Args:
-            file_name (str): name of the file to write the corners into
+            file_name (str): name of, or file object to write the corners into
         """
         corners = self.get_corners_active()
-        np.savetxt(file_name, corners.T, 
-                       header = 'A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y', 
-                       delimiter=', ',
-                       fmt = '%.3f')
+        _write_table(file_name, corners.T, 
+                     header = 'A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y')
 
 
     def get_corners_package(self) -> np.ndarray:
@@ -213,25 +231,22 @@ class SiPMarray():
                 corners of the total area (including packaging) of the SiPMs
         """
         
-        A_corner_x = (self.A_corners_xx.flatten().compressed() + 
-                        self.sipmunit.width_tolerance)
-        B_corner_x = (self.B_corners_xx.flatten().compressed() -
-                        self.sipmunit.width_tolerance)
-        C_corner_x = (self.C_corners_xx.flatten().compressed() -
-                        self.sipmunit.width_tolerance)
-        D_corner_x = (self.D_corners_xx.flatten().compressed() +
-                        self.sipmunit.width_tolerance)
-        A_corner_y = (self.A_corners_yy.flatten().compressed() -
-                        self.sipmunit.height_tolerance)
-        B_corner_y = (self.B_corners_yy.flatten().compressed() -
-                        self.sipmunit.height_tolerance)
-        C_corner_y = (self.C_corners_yy.flatten().compressed() +
-                        self.sipmunit.height_tolerance)
-        D_corner_y = (self.D_corners_yy.flatten().compressed() +
-                        self.sipmunit.height_tolerance)
-        
-        corners = np.vstack((A_corner_x, A_corner_y, B_corner_x, B_corner_y,
-                             C_corner_x, C_corner_y, D_corner_x, D_corner_y))
+        dx = self.D_corners_x
+        dy = self.D_corners_y
+        wt = self.sipmunit.width_tolerance
+        ht = self.sipmunit.height_tolerance
+
+        # rows are A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y; left/right and
+        # bottom/top edges are shared by two corners each
+        corners = np.empty((8, dx.size), dtype=dx.dtype)
+        np.add(dx, wt, out=corners[0])
+        np.subtract(self.B_corners_x, wt, out=corners[2])
+        np.add(dy, ht, out=corners[5])
+        np.subtract(self.A_corners_y, ht, out=corners[1])
+        corners[3] = corners[1]
+        corners[4] = corners[2]
+        corners[6] = corners[0]
+        corners[7] = corners[5]
 
         return corners
     
@@ -239,13 +254,11 @@ class SiPMarray():
         """Export the corners of the total area of the SiPMs to a file.
 
         Args:
-            file_name (str): name of the file to write the corners into
+            file_name (str): name of, or file object to write the corners into
         """
         corners = self.get_corners_package()
-        np.savetxt(file_name, corners.T, 
-                       header = 'A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y', 
-                       delimiter=', ',
-                       fmt = '%.3f')
+        _write_table(file_name, corners.T, 
+                     header = 'A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y')
     
     def plot_empty_array(self, unit_width: float, unit_height:float):
         """Plot simple division of the array circle in units.
@@ -254,27 +267,17 @@ class SiPMarray():
             unit_width (float): width of the unit
             unit_height (float): height of the unit
         """
-               
-        patches_sipms = []
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PolyCollection
+        from matplotlib.patches import Circle, Rectangle
 
         fig = plt.figure(figsize = (6,6))
         ax = plt.subplot(111)
 
-        n_corner_x, n_corner_y = np.shape(self.D_corners_xx)
-
-        for _x_i in range(n_corner_x):
-            for _y_i in range(n_corner_y):
-                patches_sipms.append(
-                    Rectangle(xy = (self.D_corners_xx[_x_i,_y_i], 
-                                    self.D_corners_yy[_x_i,_y_i]), 
-                              width = unit_width, 
-                              height = unit_height, 
-                              fill = True,
-                              edgecolor = 'k',
-                              facecolor = 'b',
-                              zorder = 0,
-                              alpha = 0.2,)
-                              )
+        verts_sipms = _rectangle_vertices(self.D_corners_x, 
+                                          self.D_corners_y, 
+                                          unit_width, unit_height)
+
         ax.add_patch(Circle(xy=(0,0),
                             radius = self.array_diameter/2, 
                             fill = False, 
@@ -282,8 +285,12 @@ class SiPMarray():
                             zorder = 0, 
                             label = 'Array diameter'))
 
-        p1 = PatchCollection(patches_sipms, match_original=True, 
-                             label = 'SiPM units 1')
+        p1 = PolyCollection(verts_sipms, 
+                            edgecolors = 'k',
+                            facecolors = 'b',
+                            zorder = 0,
+                            alpha = 0.2,
+                            label = 'SiPM units 1')
         ax.add_collection(p1)
         ax.set_xlabel('x [mm]')
         ax.set_ylabel('y [mm]')
@@ -301,31 +308,32 @@ class SiPMarray():
         ax.legend()
         plt.show()
         
-    def plot_sipm_array(self, figax:tuple = None):
+    def plot_sipm_array(self, figax:tuple = None, clip_bbox:tuple = None):
         """Plot the array of SiPMs.
 
         Args:
             figax (tuple, optional): figure and axis objects to draw in. 
                 Defaults to None.
+            clip_bbox (tuple, optional): (xmin, xmax, ymin, ymax) to zoom 
+                into. Only the SiPMs overlapping it are drawn. Defaults to 
+                None, the full array.
 
         Returns:
             tuple: figure and axis objects
         """
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Circle
+
         if figax is None:
             fig, ax = plt.subplots(figsize = (6,6))
         else:
             fig, ax = figax
 
-        patches_sipms = []
+        package_area, active_area = self.sipmunit.build_compound_paths(
+            np.column_stack((self.D_corners_x, self.D_corners_y)), 
+            clip_bbox = clip_bbox)
+        package_area.set_label('SiPM units 1')
 
-        n_corner_x, n_corner_y = np.shape(self.D_corners_xx)
-
-        for _x_i in range(n_corner_x):
-            for _y_i in range(n_corner_y):
-                patches_sipms += self.sipmunit.get_unit_patches(
-                    (self.D_corners_xx[_x_i,_y_i], 
-                     self.D_corners_yy[_x_i,_y_i]))
-                
         ax.add_patch(Circle(xy=(0,0),
                             radius = self.array_diameter/2, 
                             fill = False, 
@@ -333,15 +341,18 @@ class SiPMarray():
                             zorder = 0, 
                             label = 'Array diameter'))
 
-        p1 = PatchCollection(patches_sipms, match_original=True, 
-                             label = 'SiPM units 1')
-        ax.add_collection(p1)
+        ax.add_patch(package_area)
+        ax.add_patch(active_area)
         ax.set_xlabel('x')
         ax.set_ylabel('y')
         ax.set_aspect('equal')
 
-        ax.set_xlim(-self.array_diameter*1.2/2,self.array_diameter*1.2/2)
-        ax.set_ylim(-self.array_diameter*1.2/2,self.array_diameter*1.2/2)
+        if clip_bbox is None:
+            ax.set_xlim(-self.array_diameter*1.2/2,self.array_diameter*1.2/2)
+            ax.set_ylim(-self.array_diameter*1.2/2,self.array_diameter*1.2/2)
+        else:
+            ax.set_xlim(clip_bbox[0], clip_bbox[1])
+            ax.set_ylim(clip_bbox[2], clip_bbox[3])
 
         ax.legend()
 
@@ -1,7 +1,2 @@
-from .Hdb_DigitalSiPM import Hdb_DigitalSiPM
-from .S13370_3050 import S13370_3050
-from .S13370_6050 import S13370_6050
-from .S13370_6050CQ_02 import S13370_6050CQ_02
-from .S13370_6050VN import S13370_6050VN
-from .UZH_Tile import UZH_Tile
-from .model_lib import model_lib
\ No newline at end of file
+from .model_lib import model_lib
+from .registry import MODELS
\ No newline at end of file
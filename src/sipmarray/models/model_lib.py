@@ -1,6 +1,7 @@
 ## Model library for SiPMArray
 # This was supposed to be a .json file but I couldn't get it to work with the
 # python packaging, so now it's a simple python dictionary. Done.
+# Maps every accepted model name to its entry in registry.MODELS.
 
 model_lib = {
     "S13370_3050": "S13370_3050",
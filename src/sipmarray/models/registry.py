@@ -0,0 +1,114 @@
+## Parameter table of the SiPM models in SiPMArray
+# Each model is a plain dictionary with the same parameters a 'custom'
+# SiPMunit needs. The dependant properties (unit size, areas and the
+# corner of the active area) are computed by
+# SiPMunit.set_dependant_properties. The active area is centred in the
+# packaging unless the model sets an active_shift_x/active_shift_y. To add
+# a model, add an entry here and its names in model_lib.
+
+MODELS = {
+    # 3x3 VUV4 Hamamatsu SiPM unit.
+    # Ref: https://web.archive.org/web/20220401162036/https://hamamatsu.su/files/uploads/pdf/3_mppc/s13370_vuv4-mppc_b_(1).pdf
+    "S13370_3050": dict(
+        name='S13370-3050, "3x3", by Hamamatsu',
+        width_package=5.9,
+        height_package=6.55,
+        width_tolerance=0.15,
+        height_tolerance=0.15,
+        width_active=3,
+        height_active=3,
+        active_area_correction=1.,
+        # the active area is 0.33 mm below the centre of the packaging
+        active_shift_y=-0.33,
+        fill_factor=0.6,
+        pde=0.24,
+        ),
+
+    # 6x6 VUV4 Hamamatsu SiPM unit.
+    # Ref: https://web.archive.org/web/20220401162036/https://hamamatsu.su/files/uploads/pdf/3_mppc/s13370_vuv4-mppc_b_(1).pdf
+    "S13370_6050": dict(
+        name='S13370-6050, "6x6", by Hamamatsu',
+        width_package=10.1,
+        height_package=8.9,
+        width_tolerance=0.1,
+        height_tolerance=0.1,
+        width_active=6,
+        height_active=6,
+        active_area_correction=1.,
+        fill_factor=0.6,
+        pde=0.24,
+        ),
+
+    # quad (12x12) VUV4 Hamamatsu SiPM unit.
+    # Ref: https://web.archive.org/web/20220401162036/https://hamamatsu.su/files/uploads/pdf/3_mppc/s13370_vuv4-mppc_b_(1).pdf
+    "S13370_6050CQ_02": dict(
+        name='S13370-6050CQ-02, "12x12", by Hamamatsu',
+        width_package=15.,
+        height_package=15.,
+        width_tolerance=0.2,
+        height_tolerance=0.2,
+        width_active=12 + 0.5,
+        height_active=12 + 0.5,
+        # correction for the active area due to space between individual
+        # 6x6 SiPMs
+        active_area_correction=12*12/(12.5*12.5),
+        fill_factor=0.6,
+        pde=0.24,
+        ),
+
+    # 6x6 low dead space VUV4 Hamamatsu SiPM unit.
+    "S13370_6050VN": dict(
+        name='S13370_6050VN, "6x6" low dead space, by Hamamatsu',
+        width_package=6.4,
+        height_package=6.4,
+        width_tolerance=0,
+        height_tolerance=0,
+        width_active=6,
+        height_active=6,
+        active_area_correction=1.,
+        fill_factor=0.996,
+        pde=0.20,
+        ),
+
+    # Tile of VUV4 quads designed at UZH.
+    # Ref: DOI 10.1088/1748-0221/18/03/C03027
+    "UZH_Tile": dict(
+        name='UZH Tile',
+        width_package=34.,
+        height_package=34.,
+        width_tolerance=1.,
+        height_tolerance=1.,
+        # All the interior area is considered active an then corrected
+        # This means 15 + 2.38 + 15 = 32.38 mm of side length
+        width_active=32.38,
+        height_active=32.38,
+        # Correction is a composite of three parameters:
+        #   - the space between SiPMs in the quads - 12*12/(12.5*12.5)
+        #   - the fraction of active area inside the quad packaging, 0.61
+        #   - the space between quads, width_package**2 - (15+15)**2
+        active_area_correction=((12*12/(12.5*12.5)) *
+                                0.61 *
+                                (15+15)**2/(34.**2)),
+        # the active area starts 0.85 mm into the unit, inside the 1 mm
+        # tolerance
+        active_shift_x=0.85 - 1.,
+        active_shift_y=0.85 - 1.,
+        fill_factor=0.6,
+        pde=0.24,
+        ),
+
+    # Digital SiPM from University of Heidelberg, group of
+    # Prof. Peter Fischer.
+    "Hdb_DigitalSiPM": dict(
+        name='digital_sipm, from Peter Fischer (Uni. Heidelberg)',
+        width_package=65.218,
+        height_package=75.606,
+        width_tolerance=0.5,
+        height_tolerance=0.5,
+        width_active=65.218,
+        height_active=75.606,
+        active_area_correction=0.9065,
+        fill_factor=0.776,
+        pde=0.776 * 0.2,
+        ),
+    }
@@ -1,15 +1,122 @@
-from importlib import import_module
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from matplotlib.patches import Rectangle
+
+from sipmarray.models import MODELS, model_lib
+
+# matplotlib and pandas are slow to import and only needed for plotting and
+# tables, so they are imported inside the methods that use them.
+if TYPE_CHECKING:
+    import pandas as pd
+    from matplotlib.patches import PathPatch
+
+
+def _rectangle_vertices(x: np.ndarray, y: np.ndarray, 
+                        width: float, height: float) -> np.ndarray:
+    """Get the vertices of axis-aligned rectangles of the same size.
+
+    Args:
+        x (np.ndarray): x of the bottom left corners
+        y (np.ndarray): y of the bottom left corners
+        width (float): width of the rectangles
+        height (float): height of the rectangles
+
+    Returns:
+        np.ndarray: (N, 4, 2) array of the vertices, counterclockwise 
+            from the bottom left corner
+    """
+    verts = np.empty((np.size(x), 4, 2))
+    verts[:, 0, 0] = verts[:, 3, 0] = x
+    verts[:, 1, 0] = verts[:, 2, 0] = x + width
+    verts[:, 0, 1] = verts[:, 1, 1] = y
+    verts[:, 2, 1] = verts[:, 3, 1] = y + height
+    return verts
+
+
+# Style kwargs of the SiPM unit patches. Each patch is a new Rectangle
+# built with them, never a copy of a shared artist.
+_PATCH_STYLES = {
+    'package': dict(facecolor='gray', alpha=0.3, edgecolor='k', zorder=3),
+    'active': dict(facecolor='k', alpha=0.98, edgecolor='k', zorder=4),
+    'model_package': dict(facecolor='gray', alpha=0.3, edgecolor='k',
+                          label='Packaging area'),
+    'model_active': dict(facecolor='k', alpha=0.8, edgecolor='k',
+                         label='Active area'),
+    }
+
+
+def _unit_properties(width_package, height_package,
+                     width_tolerance, height_tolerance,
+                     width_active, height_active,
+                     active_area_correction) -> tuple:
+    """Compute the dependant properties of a SiPM unit. Works element-wise 
+    on arrays of the same shape.
+
+    Returns:
+        tuple: width_unit, height_unit, total_area, active_area and 
+            active_area_fraction
+    """
+    width_unit = width_package + 2*width_tolerance
+    height_unit = height_package + 2*height_tolerance
+    total_area = width_unit*height_unit
+    active_area = width_active*height_active*active_area_correction
+
+    return (width_unit, height_unit, total_area,
+            active_area, active_area/total_area)
+
+
+# main properties defining a SiPM unit model, as in models.MODELS
+_MODEL_PARAMS = ('name',
+                 'width_package',
+                 'height_package',
+                 'width_tolerance',
+                 'height_tolerance',
+                 'width_active',
+                 'height_active',
+                 'active_area_correction',
+                 'D_corner_x_active',
+                 'D_corner_y_active',
+                 'active_shift_x',
+                 'active_shift_y',
+                 'fill_factor',
+                 'pde')
+
+# defaults of the optional params. Without an explicit D_corner_*_active
+# the active area is centred in the packaging and moved by active_shift_*
+_OPTIONAL_PARAMS = {'D_corner_x_active': None,
+                    'D_corner_y_active': None,
+                    'active_shift_x': 0.,
+                    'active_shift_y': 0.}
+_REQUIRED_PARAMS = frozenset(_MODEL_PARAMS) - _OPTIONAL_PARAMS.keys()
+
+# labels of the rows of SiPMunit.get_properties_df
+_PROP_LABELS = ('Model',
+                'Width [mm]',
+                'Height [mm]',
+                'Active width [mm]',
+                'Active height [mm]',
+                'Width tolerance [mm]',
+                'Height tolerance [mm]',
+                'Total area [mm^2]',
+                'Active area geometric correction',
+                'Active area [mm^2]',
+                'Active area fraction',
+                'Photon detection efficiency')
 
 
 class SiPMunit():
     """Class to represent a SiPM unit."""
 
+    # fixed set of attributes, no per-instance __dict__
+    __slots__ = _MODEL_PARAMS + ('model',
+                                 'width_unit',
+                                 'height_unit',
+                                 'total_area',
+                                 'active_area',
+                                 'active_area_fraction',
+                                 '_pkg_offset',
+                                 '_act_offset')
+
     def __init__(self, model, custom_params = {}):
         if model == 'custom':
             self.check_custom_params(custom_params)
@@ -20,31 +127,18 @@ class SiPMunit():
         self.set_dependant_properties()
 
     def get_model_file(self, model):
-        from sipmarray.models import model_lib
-        if model in model_lib.keys():
-            self.model = model_lib[model]
-        else:
+        model_key = model_lib.get(model)
+        if model_key is None:
             raise ValueError('Model not found. Please make a PR to add it.')
+        self.model = model_key
 
     def check_custom_params(self, custom_params):
         """Check if the custom_params dictionary have all the correct params.
         """
-        params_list = ['name',
-                       'width_package',
-                       'height_package',
-                       'width_tolerance',
-                       'height_tolerance',
-                       'width_active',
-                       'height_active',
-                       'active_area_correction',
-                       'D_corner_x_active',
-                       'D_corner_y_active',
-                       'fill_factor',
-                       'pde']
-       
-        params_missing = [
-            param for param in params_list if param not in custom_params]
-        if len(params_missing) > 0:
+        params_missing = _REQUIRED_PARAMS - custom_params.keys()
+        if params_missing:
+            params_missing = [
+                param for param in _MODEL_PARAMS if param in params_missing]
             raise ValueError('The custom_params dictionary must have all the '
                              'correct parameters.\nMissing parameters: '
                              f'{params_missing}')
@@ -56,60 +150,77 @@ class SiPMunit():
             config_dict (dict): dictionary with the main properties of the
                 SiPM unit.
         """
-
-        self.name = config_dict['name']
-        self.width_package = config_dict['width_package']
-        self.height_package = config_dict['height_package']
-        self.width_tolerance = config_dict['width_tolerance']
-        self.height_tolerance = config_dict['height_tolerance']
-        self.width_active = config_dict['width_active']
-        self.height_active = config_dict['height_active']
-        self.active_area_correction = config_dict['active_area_correction']
-        self.D_corner_x_active = config_dict['D_corner_x_active']
-        self.D_corner_y_active = config_dict['D_corner_y_active']
-        self.fill_factor = config_dict['fill_factor']
-        self.pde = config_dict['pde']
-
+        for param in _MODEL_PARAMS:
+            setattr(self, param,
+                    config_dict.get(param, _OPTIONAL_PARAMS.get(param)))
 
     def get_model_geometry(self):
-        """Loads model geometric properties from the model file.
-
-        Raises:
-            ModuleNotFoundError: raised if the model file is not found.
+        """Loads model geometric properties from the model table.
         """
-        try:
-            model_module = import_module(f'sipmarray.models.{self.model}')
-            model_class = getattr(model_module, self.model)
-            _model = model_class()
-
-            self.name = _model.name
-            self.width_package = _model.width_package
-            self.height_package = _model.height_package
-            self.width_tolerance = _model.width_tolerance
-            self.height_tolerance = _model.height_tolerance
-            self.width_active = _model.width_active
-            self.height_active = _model.height_active
-            self.active_area_correction = _model.active_area_correction
-            self.D_corner_x_active = _model.D_corner_x_active
-            self.D_corner_y_active = _model.D_corner_y_active
-            self.fill_factor = _model.fill_factor
-            self.pde = _model.pde
-
-        except ModuleNotFoundError:
-            raise ModuleNotFoundError(
-                'Model not found. Please make a PR to add it.')
+        self.build_custom_model(MODELS[self.model])
 
     def set_dependant_properties(self):
         """Defines dependant properties of the SiPM unit: total area, active
-        area and active area fraction.
+        area, active area fraction and, if not given, the bottom left 
+        corner of the active area.
+        """
+        if self.D_corner_x_active is None:
+            self.D_corner_x_active = (
+                (self.width_package - self.width_active)/2 + 
+                self.active_shift_x + self.width_tolerance)
+        if self.D_corner_y_active is None:
+            self.D_corner_y_active = (
+                (self.height_package - self.height_active)/2 + 
+                self.active_shift_y + self.height_tolerance)
+
+        (self.width_unit, self.height_unit, self.total_area,
+         self.active_area, self.active_area_fraction) = _unit_properties(
+            self.width_package, self.height_package,
+            self.width_tolerance, self.height_tolerance,
+            self.width_active, self.height_active,
+            self.active_area_correction)
+
+        # bottom left corners of the packaging and active area in the unit
+        self._pkg_offset = (self.width_tolerance, self.height_tolerance)
+        self._act_offset = (self.D_corner_x_active, self.D_corner_y_active)
+
+    @classmethod
+    def vectorized_properties(cls, width_package, height_package,
+                              width_tolerance, height_tolerance,
+                              width_active, height_active,
+                              active_area_correction) -> dict:
+        """Compute the dependant properties of many SiPM units at once.
+
+        Takes floats or NumPy arrays, so the properties of a batch of 
+        units are computed in a single pass instead of one SiPMunit at a 
+        time. All the parameters are broadcast to a common shape and 
+        every property has that shape.
+
+        Args:
+            width_package: width of the packaging
+            height_package: height of the packaging
+            width_tolerance: width tolerance on each side of the packaging
+            height_tolerance: height tolerance on each side of the packaging
+            width_active: width of the active area
+            height_active: height of the active area
+            active_area_correction: geometric correction of the active area
+
+        Returns:
+            dict: width_unit, height_unit, total_area, active_area and 
+                active_area_fraction
         """
-        self.width_unit = self.width_package + 2*self.width_tolerance
-        self.height_unit = self.height_package + 2*self.height_tolerance
-        self.total_area = self.width_unit*self.height_unit
-        self.active_area = (self.width_active *
-                            self.height_active *
-                            self.active_area_correction)
-        self.active_area_fraction = self.active_area/self.total_area
+        (width_unit, height_unit, total_area,
+         active_area, active_area_fraction) = _unit_properties(
+            *np.broadcast_arrays(width_package, height_package,
+                                 width_tolerance, height_tolerance,
+                                 width_active, height_active,
+                                 active_area_correction))
+
+        return {'width_unit': width_unit,
+                'height_unit': height_unit,
+                'total_area': total_area,
+                'active_area': active_area,
+                'active_area_fraction': active_area_fraction}
 
     def get_unit_centre(self) -> Tuple[float, float]:
         """Get the centre of the SiPM unit
@@ -146,125 +257,199 @@ class SiPMunit():
         Returns:
             _type_: updated figure and axis environment
         """
-        if figax == None:
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import PatchCollection
+        from matplotlib.patches import Rectangle
+
+        if figax is None:
             fig, ax = plt.subplots(1, 1, figsize=(5, 5))
-        ax.add_patch(Rectangle((xy[0]+self.width_tolerance,
-                                xy[1]+self.height_tolerance),
-                               width=self.width_package,
-                               height=self.height_package,
-                               facecolor='gray',
-                               alpha=0.3, edgecolor='k',
-                               label='Packaging area', zorder=1))
-        ax.add_patch(Rectangle((xy[0]+self.D_corner_x_active,
-                                xy[1]+self.D_corner_y_active),
-                               width=self.width_active,
-                               height=self.height_active,
-                               facecolor='k', alpha=0.8, edgecolor='k',
-                               label='Active area', zorder=2))
+        else:
+            fig, ax = figax
+
+        x0, y0 = xy
+        wu = self.width_unit
+        hu = self.height_unit
+        x_pkg, y_pkg = self._pkg_offset
+        x_act, y_act = self._act_offset
+        patches = [Rectangle((x0+x_pkg, y0+y_pkg),
+                             self.width_package, self.height_package,
+                             **_PATCH_STYLES['model_package']),
+                   Rectangle((x0+x_act, y0+y_act),
+                             self.width_active, self.height_active,
+                             **_PATCH_STYLES['model_active'])]
+        ax.add_collection(PatchCollection(patches, match_original=True,
+                                          zorder=2))
 
         geometric_centre = self.get_unit_centre()
         active_centre = self.get_unit_active_centre()
 
-        ax.plot(geometric_centre[0], geometric_centre[1], 'o',
-                c='g', label='Geometric centre')
-        ax.plot(active_centre[0], active_centre[1], 'x',
-                c='r', label='Active centre')
+        centre_markers = (
+            ax.plot(x0+geometric_centre[0], y0+geometric_centre[1], 'o',
+                    c='g', label='Geometric centre') +
+            ax.plot(x0+active_centre[0], y0+active_centre[1], 'x',
+                    c='r', label='Active centre'))
 
-        ax.set_xlim(xy[0]-0.1*self.width_unit, xy[0]+1.1*self.width_unit)
-        ax.set_ylim(xy[1]-0.1*self.height_unit, xy[1]+1.1*self.height_unit)
+        ax.set_xlim(x0-0.1*wu, x0+1.1*wu)
+        ax.set_ylim(y0-0.1*hu, y0+1.1*hu)
         ax.set_aspect('equal')
-        ax.legend()
+        # the patches are drawn by the collection, but keep their labels
+        ax.legend(handles=patches + centre_markers)
         ax.set_xlabel('x [mm]')
         ax.set_ylabel('y [mm]')
-        ax.set_aspect('equal')
         ax.grid(zorder=-10)
 
-        if figax == None:
+        if figax is None:
             plt.show()
         else:
             return fig, ax
 
-    def get_unit_patches(self, xy: np.ndarray) -> list:
+    def in_bbox(self, xy: np.ndarray, clip_bbox: tuple):
+        """Check which SiPM units overlap a bounding box.
+
+        Args:
+            xy (np.ndarray): the coordinates of the bottom left corner of
+                the SiPM unit, or a (N,2) array of them.
+            clip_bbox (tuple): (xmin, xmax, ymin, ymax) of the box.
+
+        Returns:
+            bool or np.ndarray: True for the units overlapping the box.
+        """
+        xmin, xmax, ymin, ymax = clip_bbox
+        xy = np.asarray(xy)
+        x = xy[..., 0]
+        y = xy[..., 1]
+        return ((x + self.width_unit >= xmin) & (x <= xmax) &
+                (y + self.height_unit >= ymin) & (y <= ymax))
+
+    def get_unit_patches(self, xy: np.ndarray, 
+                         clip_bbox: tuple = None) -> list:
         """Get the patches of the SiPM unit for plotting.
 
         Args:
             xy (np.ndarray): the coordinates of the bottom left corner of
                 the SiPM unit.
+            clip_bbox (tuple, optional): (xmin, xmax, ymin, ymax) of the 
+                view. No patches are made if the unit is outside of it. 
+                Defaults to None.
 
         Returns:
             list: list of patches of the SiPM units
         """
-        p = [Rectangle((xy[0]+self.width_tolerance,
-                        xy[1]+self.height_tolerance),
-                       width=self.width_package,
-                       height=self.height_package,
-                       facecolor='gray',
-                       alpha=0.3, edgecolor='k', zorder=3),
-             Rectangle((xy[0]+self.D_corner_x_active,
-                        xy[1]+self.D_corner_y_active),
-                       width=self.width_active,
-                       height=self.height_active,
-                       facecolor='k', alpha=0.98,
-                       edgecolor='k', zorder=4)
-             ]
+        from matplotlib.patches import Rectangle
+
+        if clip_bbox is not None and not self.in_bbox(xy, clip_bbox):
+            return []
+
+        x_pkg, y_pkg = self._pkg_offset
+        x_act, y_act = self._act_offset
+        p = [Rectangle((xy[0]+x_pkg, xy[1]+y_pkg),
+                       self.width_package, self.height_package,
+                       **_PATCH_STYLES['package']),
+             Rectangle((xy[0]+x_act, xy[1]+y_act),
+                       self.width_active, self.height_active,
+                       **_PATCH_STYLES['active'])]
         return p
 
+    def get_unit_patches_batch(
+            self, xy_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the vertices of the packaging and active area rectangles 
+        of many SiPM units at once.
+
+        Args:
+            xy_array (np.ndarray): (N,2) array with the coordinates of the 
+                bottom left corners of the SiPM units.
+
+        Returns:
+            tuple: (N,4,2) arrays of the vertices of the packaging areas 
+                and of the active areas
+        """
+        xy_array = np.asarray(xy_array)[:, None, :]
+        verts_package = xy_array + _rectangle_vertices(
+            *self._pkg_offset, self.width_package, self.height_package)
+        verts_active = xy_array + _rectangle_vertices(
+            *self._act_offset, self.width_active, self.height_active)
+        return verts_package, verts_active
+
+    def build_compound_paths(self, 
+                             xy_array: np.ndarray,
+                             clip_bbox: tuple = None) -> Tuple['PathPatch', 
+                                                               'PathPatch']:
+        """Get the patches of many SiPM units as two compound paths, one 
+        with all the packaging areas and one with all the active areas. 
+        Drawing two paths is much faster than a patch per SiPM unit.
+
+        Args:
+            xy_array (np.ndarray): (N,2) array with the coordinates of the 
+                bottom left corners of the SiPM units.
+            clip_bbox (tuple, optional): (xmin, xmax, ymin, ymax) of the 
+                view. Units outside of it are left out. Defaults to None.
+
+        Returns:
+            tuple: (packaging areas, active areas) patches
+        """
+        from matplotlib.patches import PathPatch
+        from matplotlib.path import Path
+
+        if clip_bbox is not None:
+            xy_array = np.asarray(xy_array)
+            xy_array = xy_array[self.in_bbox(xy_array, clip_bbox)]
+        verts_package, verts_active = self.get_unit_patches_batch(xy_array)
+
+        package_area = PathPatch(
+            Path.make_compound_path_from_polys(verts_package),
+            facecolor='gray', alpha=0.3, edgecolor='k', zorder=3)
+        active_area = PathPatch(
+            Path.make_compound_path_from_polys(verts_active),
+            facecolor='k', alpha=0.98, edgecolor='k', zorder=4)
+        return package_area, active_area
+
     def get_properties_str(self) -> str:
         """Return a string with the main properties of the SiPM model.
         """
 
-        main_string = f'Model: {self.name}\n'
-        main_string += f'--------------------------------------------\n'
-        main_string += f'Width: {self.width_package} mm\n'
-        main_string += f'Height: {self.height_package} mm\n'
-        main_string += f'Active width: {self.width_active} mm\n'
-        main_string += f'Active height: {self.height_active} mm\n'
-        main_string += f'Width tolerance: {self.width_tolerance} mm\n'
-        main_string += f'Height tolerance: {self.height_tolerance} mm\n'
-        main_string += '--------------------------------------------\n'
-        main_string += f'Total unit area: {round(self.total_area):.2f} mm^2\n'
-        main_string += f'Active area geometric correction: {round(self.active_area_correction):.2f}\n'
-        main_string += f'Active area: {round(self.active_area):.2f} mm^2\n'
-        main_string += '--------------------------------------------\n'
-        main_string += f'Active area fraction: {round(self.active_area_fraction)*100:.2f} %\n'
-        main_string += f'Photon detection efficiency: {self.pde*100:.2f} %'
-
-        return main_string
+        separator = '--------------------------------------------'
+        return '\n'.join((
+            f'Model: {self.name}',
+            separator,
+            f'Width: {self.width_package} mm',
+            f'Height: {self.height_package} mm',
+            f'Active width: {self.width_active} mm',
+            f'Active height: {self.height_active} mm',
+            f'Width tolerance: {self.width_tolerance} mm',
+            f'Height tolerance: {self.height_tolerance} mm',
+            separator,
+            f'Total unit area: {self.total_area:.2f} mm^2',
+            f'Active area geometric correction: '
+            f'{self.active_area_correction:.2f}',
+            f'Active area: {self.active_area:.2f} mm^2',
+            separator,
+            f'Active area fraction: {self.active_area_fraction*100:.2f} %',
+            f'Photon detection efficiency: {self.pde*100:.2f} %'))
 
     def print_properties(self) -> None:
         """Print the main properties of the SiPM model
         """
         print(self.get_properties_str())
 
-    def get_properties_df(self) -> pd.DataFrame:
+    def get_properties_df(self) -> 'pd.DataFrame':
         """Get the main properties of the SiPM model in a DataFrame
 
         Returns:
             pd.DataFrame: DataFrame of the main properties of the SiPM model
         """
-        properties = {'Property': ['Model',
-                                   'Width [mm]',
-                                   'Height [mm]',
-                                   'Active width [mm]',
-                                   'Active height [mm]',
-                                   'Width tolerance [mm]',
-                                   'Height tolerance [mm]',
-                                   'Total area [mm^2]',
-                                   'Active area geometric correction',
-                                   'Active area [mm^2]',
-                                   'Active area fraction',
-                                   'Photon detection efficiency'],
-
-                      'Value': [self.name,
-                                self.width_package,
-                                self.height_package,
-                                self.width_active,
-                                self.height_active,
-                                self.width_tolerance,
-                                self.height_tolerance,
-                                round(self.total_area, 2),
-                                round(self.active_area_correction, 2),
-                                round(self.active_area, 2),
-                                round(self.active_area_fraction, 2),
-                                self.pde]}
-        return pd.DataFrame(properties)
+        import pandas as pd
+
+        values = (self.name,
+                  self.width_package,
+                  self.height_package,
+                  self.width_active,
+                  self.height_active,
+                  self.width_tolerance,
+                  self.height_tolerance,
+                  round(self.total_area, 2),
+                  round(self.active_area_correction, 2),
+                  round(self.active_area, 2),
+                  round(self.active_area_fraction, 2),
+                  self.pde)
+        return pd.DataFrame.from_records(list(zip(_PROP_LABELS, values)),
+                                         columns=['Property', 'Value'])
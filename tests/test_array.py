@@ -0,0 +1,41 @@
+import gzip
+import io
+
+import numpy as np
+import pytest
+
+from sipmarray import SiPMarray
+
+_EXPORTS = [('export_centres', 'get_centres', 'x, y'),
+            ('export_corners_active', 'get_corners_active',
+             'A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y'),
+            ('export_corners_package', 'get_corners_package',
+             'A_x, A_y, B_x, B_y, C_x, C_y, D_x, D_y')]
+
+
+def _savetxt(table: np.ndarray, header: str) -> str:
+    f = io.StringIO()
+    np.savetxt(f, table, delimiter=', ', fmt='%.3f', header=header)
+    return f.getvalue()
+
+
+@pytest.mark.parametrize('model', ['3x3', 'quad', 'tile'])
+@pytest.mark.parametrize('export, getter, header', _EXPORTS)
+def test_export_matches_savetxt(tmp_path, model, export, getter, header):
+    array = SiPMarray(array_diameter=150, sipm_model=model)
+    expected = _savetxt(getattr(array, getter)().T, header)
+
+    getattr(array, export)(tmp_path / 'table.csv')
+    assert (tmp_path / 'table.csv').read_bytes() == expected.encode('latin1')
+
+    f = io.StringIO()
+    getattr(array, export)(f)
+    assert f.getvalue() == expected
+
+    f = io.BytesIO()
+    getattr(array, export)(f)
+    assert f.getvalue() == expected.encode('latin1')
+
+    getattr(array, export)(str(tmp_path / 'table.csv.gz'))
+    with gzip.open(tmp_path / 'table.csv.gz', 'rt') as f:
+        assert f.read() == expected
@@ -0,0 +1,50 @@
+import sys
+
+import numpy as np
+import pytest
+
+from sipmarray import SiPMarray
+from sipmarray import _kernels
+from sipmarray._kernels import cut_outside_radius_numpy
+from sipmarray.models import MODELS
+
+
+@pytest.mark.parametrize('model', list(MODELS))
+@pytest.mark.parametrize('array_diameter', [20, 150, 1000])
+@pytest.mark.parametrize('border_margin', [-10, 0, 15])
+@pytest.mark.parametrize('intra_sipm_distance', [0, 0.5])
+def test_numba_and_numpy_cuts_agree(model, array_diameter, border_margin,
+                                    intra_sipm_distance):
+    numba_kernels = pytest.importorskip('sipmarray._numba_kernels')
+    array = SiPMarray(array_diameter=array_diameter,
+                      border_margin=border_margin,
+                      intra_sipm_distance=intra_sipm_distance,
+                      sipm_model=model)
+    x_coords, y_coords = array.make_corners()
+    args = (x_coords, y_coords,
+            array.sipmunit.width_unit, array.sipmunit.height_unit,
+            array_diameter/2 - border_margin)
+
+    x_numba, y_numba = numba_kernels.cut_outside_radius_numba(*args)
+    x_numpy, y_numpy = cut_outside_radius_numpy(*args)
+
+    np.testing.assert_array_equal(x_numba, x_numpy)
+    np.testing.assert_array_equal(y_numba, y_numpy)
+
+
+def test_broken_numba_falls_back_to_numpy(monkeypatch):
+    # a None entry in sys.modules makes the import raise ImportError
+    monkeypatch.setitem(sys.modules, 'sipmarray._numba_kernels', None)
+    monkeypatch.setattr(_kernels, 'HAS_NUMBA', True)
+    monkeypatch.setattr(_kernels, 'NUMBA_MIN_CELLS', 0)
+
+    array = SiPMarray(array_diameter=150, sipm_model='quad')
+    x_coords, y_coords = array.make_corners()
+    args = (x_coords, y_coords,
+            array.sipmunit.width_unit, array.sipmunit.height_unit, 75.)
+
+    x_cut, y_cut = _kernels.cut_outside_radius(*args)
+    x_numpy, y_numpy = cut_outside_radius_numpy(*args)
+
+    np.testing.assert_array_equal(x_cut, x_numpy)
+    np.testing.assert_array_equal(y_cut, y_numpy)
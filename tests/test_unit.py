@@ -0,0 +1,60 @@
+import numpy as np
+
+from sipmarray import SiPMunit
+from sipmarray.models import MODELS
+
+_PARAMS = ('width_package', 'height_package',
+           'width_tolerance', 'height_tolerance',
+           'width_active', 'height_active',
+           'active_area_correction')
+
+
+def test_vectorized_properties_match_units():
+    models = list(MODELS)
+    params = [np.array([MODELS[model][name] for model in models])
+              for name in _PARAMS]
+    properties = SiPMunit.vectorized_properties(*params)
+
+    for i, model in enumerate(models):
+        unit = SiPMunit(model)
+        for name, values in properties.items():
+            assert values[i] == getattr(unit, name), (model, name)
+
+
+def test_vectorized_properties_broadcast():
+    # only the package dimensions vary, the active area is a scalar
+    params = dict(MODELS['S13370_6050'])
+    params['width_package'] = np.linspace(8, 12, 5)
+    params['height_package'] = np.linspace(8, 12, 5)[:, None]
+    properties = SiPMunit.vectorized_properties(
+        *[params[name] for name in _PARAMS])
+
+    for name, values in properties.items():
+        assert np.shape(values) == (5, 5), name
+    np.testing.assert_array_equal(properties['active_area'], 36.)
+
+
+def test_vectorized_properties_scalars():
+    properties = SiPMunit.vectorized_properties(
+        *[MODELS['S13370_6050'][name] for name in _PARAMS])
+
+    for name, value in properties.items():
+        assert np.ndim(value) == 0, name
+
+
+def test_active_corner_derived_from_unit_params():
+    params = dict(MODELS['S13370_3050'])
+    unit = SiPMunit('custom', params)
+    assert unit.D_corner_x_active == (5.9 - 3)/2 + 0.15
+    assert unit.D_corner_y_active == (6.55 - 3)/2 - 0.33 + 0.15
+
+    # the corner follows a change of the package size
+    params['width_package'] = 7.9
+    assert SiPMunit('custom', params).D_corner_x_active == (7.9 - 3)/2 + 0.15
+
+
+def test_custom_active_corner_given_explicitly():
+    params = dict(MODELS['S13370_6050'], D_corner_x_active=0.4,
+                  D_corner_y_active=0.7)
+    unit = SiPMunit('custom', params)
+    assert (unit.D_corner_x_active, unit.D_corner_y_active) == (0.4, 0.7)